@@ -1,5 +1,7 @@
 __version__ = "0.0.1"
 
 from cvision.video.video import Video 
+from cvision.video.nvdec_reader import NvDecVideoReader
+from cvision.video.pyav_reader import PyAVVideoReader
 from cvision.video.video_reader import VideoReader 
 from cvision.video.video_meta import VideoMetaData 
\ No newline at end of file
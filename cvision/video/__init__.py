@@ -1,8 +1,17 @@
 from .video import Video
+from .frame_pool import FramePool, PooledFrame
+from .frame_writer import FrameWriter
+from .nvdec_reader import NvDecVideoReader
+from .pyav_reader import PyAVVideoReader
 from .video_meta import VideoMetaData
 from .video_reader import VideoReader
 
 __all__ = [
+    "FramePool",
+    "FrameWriter",
+    "NvDecVideoReader",
+    "PooledFrame",
+    "PyAVVideoReader",
     "Video",
     "VideoMetaData",
     "VideoReader",
@@ -0,0 +1,94 @@
+from __future__ import annotations
+from typing import List, Optional, Tuple
+import numpy as np
+
+
+class FramePool:
+    """
+    A pool of preallocated frame buffers that can be reused for decoding.
+
+    Attributes:
+        shape (Tuple[int, ...]): The shape of the frame buffers.
+        dtype (np.dtype): The data type of the frame buffers.
+        size (int): The maximum number of idle buffers kept by the pool.
+
+    Methods:
+        acquire(): Returns an idle buffer, or a newly allocated one if the pool is empty.
+        release(buffer): Returns a buffer to the pool.
+    """
+    def __init__(self, shape: Tuple[int, ...], dtype=np.uint8, size: int = 4) -> None:
+        """
+        Initializes a new instance of the `FramePool` class and allocates `size` buffers.
+
+        Args:
+            shape (Tuple[int, ...]): The shape of the frame buffers, usually (height, width, 3).
+            dtype (np.dtype, optional): The data type of the frame buffers. Defaults to np.uint8.
+            size (int, optional): The maximum number of idle buffers kept by the pool. Defaults to 4.
+        """
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.size = size
+        self._buffers: List[np.ndarray] = [np.empty(self.shape, self.dtype) for _ in range(size)]
+
+    def acquire(self) -> np.ndarray:
+        """
+        Returns an idle buffer, or a newly allocated one if all buffers are in use.
+
+        Returns:
+            np.ndarray: An uninitialized buffer of the pool's shape and data type.
+        """
+        if self._buffers:
+            return self._buffers.pop()
+        return np.empty(self.shape, self.dtype)
+
+    def release(self, buffer: np.ndarray) -> None:
+        """
+        Returns a buffer to the pool. Buffers that don't match the pool's shape and data type, or that exceed
+        the pool's size, are dropped.
+
+        Args:
+            buffer (np.ndarray): The buffer to return.
+        """
+        if len(self._buffers) < self.size and buffer.shape == self.shape and buffer.dtype == self.dtype:
+            self._buffers.append(buffer)
+
+
+class PooledFrame:
+    """
+    A frame whose buffer is returned to its `FramePool` once it is released.
+
+    The buffer is released when `release()` is called, when a `with` block using the frame exits or when the
+    frame is garbage collected. The array must not be used after the frame has been released.
+
+    Attributes:
+        array (np.ndarray): The frame data.
+    """
+    __slots__ = ("array", "_pool")
+
+    def __init__(self, array: np.ndarray, pool: FramePool) -> None:
+        """
+        Initializes a new instance of the `PooledFrame` class.
+
+        Args:
+            array (np.ndarray): The frame data, usually a buffer acquired from `pool`.
+            pool (FramePool): The pool the buffer is returned to.
+        """
+        self.array = array
+        self._pool: Optional[FramePool] = pool
+
+    def __enter__(self) -> np.ndarray:
+        return self.array
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.release()
+
+    def __del__(self) -> None:
+        self.release()
+
+    def release(self) -> None:
+        """
+        Returns the buffer to its pool. Calling it more than once has no effect.
+        """
+        if self._pool is not None:
+            self._pool.release(self.array)
+            self._pool = None
@@ -0,0 +1,105 @@
+from __future__ import annotations
+from pathlib import Path
+from typing import Optional, Union
+import os
+import queue
+import threading
+import cv2
+import numpy as np
+
+
+class FrameWriter:
+    """
+    A class for writing frames to disk in a background thread.
+
+    Frames are passed to a writer thread through a bounded queue, so that decoding the next frame overlaps with
+    encoding the previous one. OpenCV releases the GIL while encoding, so both threads run concurrently.
+    The queue size bounds the memory held by pending frames to `maxsize * width * height * 3` bytes.
+
+    Frames are encoded in memory with `cv2.imencode` and written with a single `os.write`. Where available,
+    `posix_fadvise(POSIX_FADV_DONTNEED)` starts the writeback right away and keeps written images from piling up
+    in the page cache during long extractions.
+
+    Attributes:
+        maxsize (int): The maximum number of frames waiting to be written. Defaults to 8.
+
+    Methods:
+        __enter__(): Starts the writer thread and returns the instance of the FrameWriter class.
+        __exit__(exc_type, exc_val, exc_tb): Waits for all pending frames to be written and stops the writer thread.
+        write(filename, frame): Queues a frame to be written to `filename`.
+    """
+    _STOP = object()
+    _FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+
+    def __init__(self, maxsize: int = 8) -> None:
+        """
+        Initializes a new instance of the `FrameWriter` class.
+
+        Args:
+            maxsize (int, optional): The maximum number of frames waiting to be written. Defaults to 8.
+        """
+        self.maxsize = maxsize
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._error: Optional[BaseException] = None
+
+    def __enter__(self) -> FrameWriter:
+        """
+        Context manager enter method. Starts the writer thread and returns the instance of the FrameWriter class.
+        """
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        """
+        Context manager exit method. Waits for all pending frames to be written and stops the writer thread.
+
+        Raises:
+            BaseException: Any exception raised while writing a frame, if no other exception is propagating.
+        """
+        self._queue.put(self._STOP)
+        self._thread.join()
+        if exc_type is None and self._error is not None:
+            raise self._error
+
+    def write(self, filename: Union[str, Path], frame: np.ndarray) -> None:
+        """
+        Queues a frame to be written to `filename`. Blocks while the queue is full.
+
+        Args:
+            filename (Union[str, Path]): The path of the image file, the image format is derived from its suffix.
+            frame (np.ndarray): The frame to write. It must not be modified until it has been written.
+
+        Raises:
+            BaseException: Any exception raised while writing a previous frame.
+        """
+        if self._error is not None:
+            raise self._error
+        self._queue.put((Path(filename).as_posix(), frame))
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is self._STOP:
+                return
+            if self._error is not None:
+                continue
+            try:
+                self._write(*item)
+            except BaseException as e:
+                self._error = e
+
+    def _write(self, filename: str, frame: np.ndarray) -> None:
+        extension = os.path.splitext(filename)[1]
+        ret, buffer = cv2.imencode(extension, frame)
+        if not ret:
+            raise ValueError(f"Could not encode frame as '{extension}'")
+        data = memoryview(buffer.reshape(-1))
+        fd = os.open(filename, self._FLAGS, 0o666)
+        try:
+            while data:
+                data = data[os.write(fd, data):]
+            if hasattr(os, "posix_fadvise"):
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
@@ -0,0 +1,145 @@
+from pathlib import Path
+from typing import List, Optional, Tuple
+import shutil
+import subprocess
+import cv2
+from .frame_writer import FrameWriter
+
+
+def probe_keyframes(path: str, timeout: Optional[float] = None) -> List[int]:
+    """
+    Returns the display indices of the keyframes of the first video stream of a file.
+
+    The packets' timestamps and flags are read with `ffprobe`, which only demuxes the file and does not decode it.
+    If `ffprobe` is not available, fails or times out, the first frame is returned as the only keyframe.
+
+    Args:
+        path (str): The path to the video file.
+        timeout (Optional[float], optional): The maximum number of seconds to wait for `ffprobe`. Defaults to None.
+
+    Returns:
+        List[int]: The sorted frame indices of all keyframes, always starting with 0.
+    """
+    ffprobe = shutil.which("ffprobe")
+    if ffprobe is None:
+        return [0]
+    cmd = [ffprobe, "-v", "error", "-select_streams", "v:0",
+           "-show_entries", "packet=pts,flags", "-of", "csv=p=0", str(path)]
+    try:
+        output = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=True,
+                                timeout=timeout).stdout
+    except (OSError, subprocess.CalledProcessError, subprocess.TimeoutExpired):
+        return [0]
+    return parse_keyframes(output.decode().split())
+
+
+def parse_keyframes(packets: List[str]) -> List[int]:
+    """
+    Maps packets, given as `pts,flags` lines in decode order, to the display indices of the keyframes.
+
+    Packets are demuxed in decode order, which only matches the display order for closed GOPs. With open GOPs,
+    leading B-frames follow their keyframe in decode order but are displayed before it, so the display index of a
+    keyframe is the rank of its timestamp among all timestamps instead of its position in the packet list.
+
+    Args:
+        packets (List[str]): The `pts,flags` lines printed by `ffprobe`. Packets without a timestamp are ignored.
+
+    Returns:
+        List[int]: The sorted frame indices of all keyframes, always starting with 0.
+    """
+    timestamps = []
+    keyframe_timestamps = []
+    for packet in packets:
+        pts, _, flags = packet.partition(",")
+        if not pts.lstrip("-").isdigit():
+            continue
+        timestamps.append(int(pts))
+        if "K" in flags:
+            keyframe_timestamps.append(int(pts))
+    rank = {pts: index for index, pts in enumerate(sorted(timestamps))}
+    keyframes = sorted(rank[pts] for pts in keyframe_timestamps)
+    if not keyframes or keyframes[0] != 0:
+        keyframes.insert(0, 0)
+    return keyframes
+
+
+def estimate_gop_size(path: str, frame_count: int, timeout: Optional[float] = None) -> float:
+    """
+    Estimates the average number of frames between two keyframes of a video, see `probe_keyframes`.
+
+    Args:
+        path (str): The path to the video file.
+        frame_count (int): The total number of frames in the video.
+        timeout (Optional[float], optional): The maximum number of seconds to wait for `ffprobe`. Defaults to None.
+
+    Returns:
+        float: The average GOP size. Equals `frame_count` if the keyframes can't be probed, and is infinite if
+        `frame_count` is unknown (not positive), so that frames are never skipped by seeking.
+    """
+    if frame_count <= 0:
+        return float("inf")
+    return frame_count / len(probe_keyframes(path, timeout))
+
+
+def split_gops(keyframes: List[int], frame_count: int, parts: int) -> List[Tuple[int, Optional[int]]]:
+    """
+    Partitions a video into at most `parts` contiguous frame ranges that start at keyframes.
+
+    The ranges are chosen so that every range covers roughly the same number of frames. Since every range starts
+    at a keyframe, the ranges can be decoded independently of each other.
+
+    Args:
+        keyframes (List[int]): The sorted frame indices of all keyframes, see `probe_keyframes`.
+        frame_count (int): The total number of frames in the video.
+        parts (int): The maximum number of ranges.
+
+    Returns:
+        List[Tuple[int, Optional[int]]]: A list of `(start, end)` frame ranges, where `end` is exclusive. The `end`
+        of the last range is None, so that it reads until the end of the video.
+    """
+    starts = [0]
+    for part in range(1, max(parts, 1)):
+        target = part * frame_count / parts
+        start = next((keyframe for keyframe in keyframes if keyframe >= target), None)
+        if start is None or start >= frame_count:
+            break
+        if start > starts[-1]:
+            starts.append(start)
+    ends = starts[1:] + [None]
+    return list(zip(starts, ends))
+
+
+def save_frame_range(path: str,
+                     start: int,
+                     end: Optional[int],
+                     steps: int,
+                     output_dir: Path,
+                     img_format: str) -> None:
+    """
+    Decodes the frames `[start, end)` of a video and saves every `steps`-th frame to disk.
+
+    Frames are encoded and written by a `FrameWriter` thread while the next frames are decoded.
+    Frames are named by their index among all sampled frames of the video, i.e. `{index // steps}.{img_format}`,
+    so that ranges processed by different workers produce the same files as a sequential pass.
+
+    Args:
+        path (str): The path to the video file.
+        start (int): The index of the first frame, should be a keyframe.
+        end (Optional[int]): The index of the frame to stop at (exclusive), or None to read until the end.
+        steps (int): The number of frames between two saved frames.
+        output_dir (Path): The directory to save the extracted frames to.
+        img_format (str): The image format to save the extracted frames in.
+    """
+    cap = cv2.VideoCapture(str(path))
+    if start > 0:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+    index = start
+    with FrameWriter() as writer:
+        while (end is None or index < end) and cap.grab():
+            if index % steps == 0:
+                ret, frame = cap.retrieve()
+                if not ret:
+                    break
+                writer.write(output_dir / f"{index // steps}.{img_format}", frame)
+            index += 1
+    cap.release()
@@ -0,0 +1,235 @@
+from __future__ import annotations
+from typing import Any, Iterator, List, Optional, Tuple
+import re
+import traceback
+from .sampling import get_steps
+from .video_meta import VideoMetaData
+
+
+class NvDecVideoReader:
+    """
+    A class for reading and extracting frames from video files with NVIDIA's hardware decoder (NVDEC).
+
+    Frames are decoded by PyNvVideoCodec directly into GPU memory and returned as CUDA `torch.Tensor`s of
+    shape (height, width, 3) in RGB channel order. Both `PyNvVideoCodec` and `torch` are optional dependencies
+    and are only imported when a reader is created.
+
+    Attributes:
+        path (str): The path to the video file.
+        interval (int): The number of seconds between each frame. Defaults to 1.
+        start_time (int): The start time of the video in seconds. Defaults to 0.
+        gpu_id (int): The index of the GPU used for decoding. Defaults to 0.
+        metadata (VideoMetaData): The metadata of the video file.
+
+    Methods:
+        __enter__(): Creates the demuxer and decoder and returns the instance of the NvDecVideoReader class.
+        __exit__(exc_type, exc_val, exc_tb): Releases the decoder and prints any exception traceback if exists.
+        __len__(): Returns the total number of frames in the video.
+        __iter__(): Iterates over the frames of the video file, same as `generator()`.
+        get_steps(): Returns the number of frames to skip in order to obtain the desired frame interval.
+        extract_frames(): Extracts and returns all frames of the video.
+        generator(): Generator that iterates over the frames of the video file. Each iteration returns a frame as a
+            CUDA tensor.
+        pipeline(ops): Generator that iterates over the frames of the video file after preprocessing them on the GPU
+            with CV-CUDA.
+    """
+    def __init__(self,
+                 path: str,
+                 interval: int = 1,
+                 start_time: int = 0,
+                 gpu_id: int = 0,
+                 metadata: Optional[VideoMetaData] = None) -> None:
+        """
+        Initializes a new instance of the `NvDecVideoReader` class.
+
+        Args:
+            path (str): The path to the video file.
+            interval (int, optional): The desired frame interval. Only every `interval`-th frame will be returned
+                by the `generator` and `extract_frames` methods. Defaults to 1.
+            start_time (int, optional): The time in seconds to start reading the video from. Defaults to 0.
+            gpu_id (int, optional): The index of the GPU used for decoding. Defaults to 0.
+            metadata (Optional[VideoMetaData], optional): The metadata of the video file, if already known.
+                Defaults to None.
+
+        Raises:
+            ImportError: If `PyNvVideoCodec` or `torch` is not installed.
+        """
+        try:
+            import PyNvVideoCodec as nvc
+            import torch
+        except ImportError as e:
+            raise ImportError("The 'cuda' backend requires the optional dependencies 'PyNvVideoCodec' and 'torch'. "
+                              "Install them with `pip install PyNvVideoCodec torch`.") from e
+        self._nvc = nvc
+        self._torch = torch
+        self.path = str(path)
+        self.interval = interval
+        self.start_time = start_time
+        self.gpu_id = gpu_id
+        self.metadata = metadata if metadata is not None else VideoMetaData.from_path(path=self.path)
+        self.demuxer = None
+        self.decoder = None
+
+    def __enter__(self) -> NvDecVideoReader:
+        """
+        Context manager enter method. Creates the demuxer and decoder and returns the instance of the
+        NvDecVideoReader class.
+        """
+        self.demuxer = self._nvc.CreateDemuxer(filename=self.path)
+        self.decoder = self._nvc.CreateDecoder(gpuid=self.gpu_id,
+                                               codec=self.demuxer.GetNvCodecId(),
+                                               cudacontext=0,
+                                               cudastream=0,
+                                               usedevicememory=True,
+                                               outputColorType=self._nvc.OutputColorType.RGB)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        """
+        Context manager exit method. Releases the decoder and prints any exception traceback if exists.
+
+        Args:
+            exc_type (Type): The type of the exception raised.
+            exc_val (Exception): The exception instance raised.
+            exc_tb (Traceback): The traceback object representing the call stack at the point where the exception
+                originally occurred.
+        """
+        self.decoder = None
+        self.demuxer = None
+        # Closing a generator early raises GeneratorExit inside the `with` block, which is not an error.
+        if exc_type is not None and not issubclass(exc_type, GeneratorExit):
+            print(f"Error occurred: {exc_val}")
+            traceback.print_exception(exc_type, exc_val, exc_tb)
+
+    def __len__(self) -> int:
+        """
+        Returns the total number of frames in the video.
+
+        Returns:
+            int: The total number of frames in the video.
+        """
+        return self.metadata.frame_count
+
+    def __iter__(self) -> Iterator[Any]:
+        """
+        Iterates over the frames of the video file, see `generator()`.
+        """
+        return self.generator()
+
+    def get_steps(self) -> int:
+        """
+        Returns the number of frames to skip in order to obtain the desired frame interval.
+
+        Returns:
+            int: The number of frames to skip.
+        """
+        return get_steps(self.metadata.fps, self.interval)
+
+    def extract_frames(self) -> List[Any]:
+        """
+        Extracts and returns all frames of the video.
+
+        If the `interval` attribute of the instance is set to a positive integer,
+        only every `interval`-th frame is returned. Otherwise, all frames are returned.
+
+        Returns:
+            A list of CUDA tensors, each representing a single frame of the video.
+        """
+        # Decoded surfaces are reused by the decoder, so frames that are kept have to be cloned.
+        return [frame.clone() for frame in self.generator()]
+
+    def generator(self) -> Iterator[Any]:
+        """
+        Generator that iterates over the frames of the video file.
+        Each iteration returns a frame as a CUDA tensor of shape (height, width, 3) in RGB channel order.
+
+        The returned tensor is backed by a decoder surface and is only valid until the next frame is requested.
+        Clone it if it has to be kept.
+
+        If the `interval` attribute of the instance is set to a positive integer,
+        only every `interval`-th frame is returned. Otherwise, all frames are returned.
+
+        Returns:
+            Iterator[torch.Tensor]: A generator of CUDA tensors representing the video frames.
+        """
+        steps = self.get_steps()
+        first = int(self.start_time * self.metadata.fps)
+        index = 0
+        for packet in self.demuxer:
+            for surface in self.decoder.Decode(packet):
+                if index >= first and (index - first) % steps == 0:
+                    yield self._torch.from_dlpack(surface)
+                index += 1
+
+    def pipeline(self, ops: List[str]) -> Iterator[Any]:
+        """
+        Generator that iterates over the frames of the video file after preprocessing them with CV-CUDA.
+
+        All operations are fused into a single `cvcuda.resize_crop_convert_reformat` kernel, which reads every
+        decoded frame once and writes the result once, on a dedicated CUDA stream. Frames never leave the GPU.
+        `cvcuda` is an optional dependency and is only imported when the pipeline is created.
+
+        Frames are decoded in RGB channel order, see `generator()`.
+
+        Supported operations:
+            "bgr2rgb": Return the frames in RGB channel order. They already are, so this is a no-op that keeps
+                pipelines written for BGR (OpenCV) frames working.
+            "rgb2bgr": Reverse the channels, returning the frames in BGR channel order.
+            "resize=(h,w)": Resize the frame to height `h` and width `w` with bilinear interpolation.
+            "normalize": Convert the frame to float32 in the range [0, 1].
+
+        Args:
+            ops (List[str]): The operations to apply. Since they are fused, their order doesn't matter.
+
+        Returns:
+            Iterator[torch.Tensor]: A generator of CUDA tensors of shape (height, width, 3) representing the
+            preprocessed video frames.
+
+        Raises:
+            ImportError: If `cvcuda` is not installed.
+            ValueError: If an operation is not supported.
+        """
+        try:
+            import cvcuda
+        except ImportError as e:
+            raise ImportError("NvDecVideoReader.pipeline requires the optional dependency 'cvcuda'. "
+                              "Install it with `pip install cvcuda-cu12`.") from e
+        reverse, size, normalize = self._parse_ops(ops)
+        height, width = size if size is not None else (self.metadata.height, self.metadata.width)
+        manip = cvcuda.ChannelManip.REVERSE if reverse else cvcuda.ChannelManip.NO_OP
+        data_type = cvcuda.Type.F32 if normalize else cvcuda.Type.U8
+        scale = 1 / 255 if normalize else 1.0
+        torch = self._torch
+        torch_stream = torch.cuda.Stream()
+        stream = cvcuda.as_stream(torch_stream)
+        for frame in self.generator():
+            torch_stream.wait_stream(torch.cuda.current_stream())
+            tensor = cvcuda.as_tensor(frame.unsqueeze(0), "NHWC")
+            crop = cvcuda.RectI(x=0, y=0, width=width, height=height)
+            tensor = cvcuda.resize_crop_convert_reformat(tensor, (width, height), cvcuda.Interp.LINEAR, crop,
+                                                         layout="NHWC", data_type=data_type, manip=manip,
+                                                         scale=scale, stream=stream)
+            event = torch_stream.record_event()
+            torch.cuda.current_stream().wait_stream(torch_stream)
+            yield torch.as_tensor(tensor.cuda(), device="cuda").squeeze(0)
+            # The decoder isn't ordered after the pipeline's stream, so the decoded surface must not be reused
+            # before the kernel has read it.
+            event.synchronize()
+
+    @staticmethod
+    def _parse_ops(ops: List[str]) -> Tuple[bool, Optional[Tuple[int, int]], bool]:
+        # Returns whether the channels are reversed, the (height, width) to resize to and whether to normalize.
+        reverse, size, normalize = False, None, False
+        for op in ops:
+            match = re.fullmatch(r"resize=\(\s*(\d+)\s*,\s*(\d+)\s*\)", op)
+            if op == "bgr2rgb":
+                continue
+            elif op == "rgb2bgr":
+                reverse = not reverse
+            elif match is not None:
+                size = (int(match.group(1)), int(match.group(2)))
+            elif op == "normalize":
+                normalize = True
+            else:
+                raise ValueError(f"Unsupported pipeline operation '{op}'")
+        return reverse, size, normalize
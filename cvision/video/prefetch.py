@@ -0,0 +1,100 @@
+from typing import Any, Iterable, Iterator, Tuple, TypeVar
+import queue
+import threading
+
+T = TypeVar("T")
+
+_DONE = object()
+
+
+def prefetch(iterable: Iterable[T], maxsize: int = 4) -> Iterator[T]:
+    """
+    Iterates over `iterable` in a background thread, keeping up to `maxsize` items ready for the consumer.
+
+    The producer thread blocks once `maxsize` items are waiting, so memory stays bounded. Exceptions raised by
+    `iterable` are re-raised in the consumer. Closing the returned generator early stops the producer thread.
+
+    Args:
+        iterable (Iterable[T]): The items to prefetch, usually a generator that decodes frames.
+        maxsize (int, optional): The maximum number of items prefetched ahead of the consumer. Defaults to 4.
+
+    Returns:
+        Iterator[T]: A generator of the items of `iterable`, in order.
+    """
+    items = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+
+    def put(item: Any) -> bool:
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        iterator = iter(iterable)
+        try:
+            for item in iterator:
+                if not put((item, None)):
+                    return
+            put((_DONE, None))
+        except BaseException as e:
+            put((_DONE, e))
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item, error = items.get()
+            if error is not None:
+                raise error
+            if item is _DONE:
+                return
+            yield item
+    finally:
+        stop.set()
+        thread.join()
+
+
+def prefetch_cuda(iterable: Iterable[Tuple[Any, Any]], maxsize: int = 4) -> Iterator[Tuple[Any, Any]]:
+    """
+    Like `prefetch`, for `(key, tensor)` pairs of CUDA tensors that are only valid until the next item is produced,
+    such as the frames of `NvDecVideoReader.generator()`.
+
+    The producer thread copies every tensor on a separate CUDA stream, so the copy of frame N+1 runs while the
+    consumer's kernels for frame N are still executing. The producer waits for each copy to finish before it pulls
+    the next item, as the decoder may reuse the source memory for it.
+
+    Args:
+        iterable (Iterable[Tuple[Any, torch.Tensor]]): The `(key, tensor)` pairs to prefetch.
+        maxsize (int, optional): The maximum number of items prefetched ahead of the consumer. Defaults to 4.
+
+    Returns:
+        Iterator[Tuple[Any, torch.Tensor]]: A generator of `(key, tensor)` pairs with tensors owned by the caller.
+    """
+    import torch
+
+    copy_stream = torch.cuda.Stream()
+
+    def stage() -> Iterator[Tuple[Any, Any, Any]]:
+        for key, tensor in iterable:
+            copy_stream.wait_stream(torch.cuda.current_stream())
+            with torch.cuda.stream(copy_stream):
+                tensor = tensor.clone()
+            event = copy_stream.record_event()
+            # The decoder isn't ordered after the copy stream, so the source must not be released before the copy
+            # is done. This only blocks the producer thread.
+            event.synchronize()
+            yield key, tensor, event
+
+    for key, tensor, event in prefetch(stage(), maxsize):
+        current_stream = torch.cuda.current_stream()
+        current_stream.wait_event(event)
+        tensor.record_stream(current_stream)
+        yield key, tensor
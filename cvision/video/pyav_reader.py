@@ -0,0 +1,189 @@
+from __future__ import annotations
+from typing import Iterator, Optional
+import traceback
+import numpy as np
+from .sampling import get_steps
+from .video_meta import VideoMetaData
+
+
+class PyAVVideoReader:
+    """
+    A class for reading and extracting frames from video files with PyAV.
+
+    PyAV hands out frames as numpy arrays over the decoded FFmpeg buffer, so padded frames (e.g. 1080 pixel rows
+    with a linesize aligned above the width) are returned as strided views instead of being copied into a
+    contiguous array. `PyAV` is an optional dependency and is only imported when a reader is created.
+
+    Attributes:
+        path (str): The path to the video file.
+        interval (int): The number of seconds between each frame. Defaults to 1.
+        start_time (int): The start time of the video in seconds. Defaults to 0.
+        metadata (VideoMetaData): The metadata of the video file.
+
+    Methods:
+        __enter__(): Opens the container and returns the instance of the PyAVVideoReader class.
+        __exit__(exc_type, exc_val, exc_tb): Closes the container and prints any exception traceback if exists.
+        __len__(): Returns the total number of frames in the video.
+        __iter__(): Iterates over the frames of the video file, same as `generator()`.
+        get_steps(): Returns the number of frames to skip in order to obtain the desired frame interval.
+        extract_frames(): Extracts and returns all frames of the video.
+        generator(): Generator that iterates over the frames of the video file. Each iteration returns a frame as a
+            NumPy array.
+        iter_raw(): Generator that iterates over the frames of the video file as read-only views over the buffers
+            owned by FFmpeg.
+    """
+    def __init__(self,
+                 path: str,
+                 interval: int = 1,
+                 start_time: int = 0,
+                 metadata: Optional[VideoMetaData] = None) -> None:
+        """
+        Initializes a new instance of the `PyAVVideoReader` class.
+
+        Args:
+            path (str): The path to the video file.
+            interval (int, optional): The desired frame interval. Only every `interval`-th frame will be returned
+                by the `generator` and `extract_frames` methods. Defaults to 1.
+            start_time (int, optional): The time in seconds to start reading the video from. Defaults to 0.
+            metadata (Optional[VideoMetaData], optional): The metadata of the video file, if already known.
+                Defaults to None.
+
+        Raises:
+            ImportError: If `PyAV` is not installed.
+        """
+        try:
+            import av
+        except ImportError as e:
+            raise ImportError("The 'pyav' backend requires the optional dependency 'av'. "
+                              "Install it with `pip install av`.") from e
+        self._av = av
+        self.path = str(path)
+        self.interval = interval
+        self.start_time = start_time
+        self.metadata = metadata if metadata is not None else VideoMetaData.from_path(path=self.path)
+        self.container = None
+
+    def __enter__(self) -> PyAVVideoReader:
+        """
+        Context manager enter method. Opens the container and returns the instance of the PyAVVideoReader class.
+        """
+        self.container = self._av.open(self.path)
+        self.stream = self.container.streams.video[0]
+        self.stream.thread_type = "AUTO"
+        if self.start_time > 0:
+            self.container.seek(int(self.start_time / self.stream.time_base), stream=self.stream)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        """
+        Context manager exit method. Closes the container and prints any exception traceback if exists.
+
+        Args:
+            exc_type (Type): The type of the exception raised.
+            exc_val (Exception): The exception instance raised.
+            exc_tb (Traceback): The traceback object representing the call stack at the point where the exception
+                originally occurred.
+        """
+        if self.container is not None:
+            self.container.close()
+        # Closing a generator early raises GeneratorExit inside the `with` block, which is not an error.
+        if exc_type is not None and not issubclass(exc_type, GeneratorExit):
+            print(f"Error occurred: {exc_val}")
+            traceback.print_exception(exc_type, exc_val, exc_tb)
+
+    def __len__(self) -> int:
+        """
+        Returns the total number of frames in the video.
+
+        Returns:
+            int: The total number of frames in the video.
+        """
+        return self.metadata.frame_count
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        """
+        Iterates over the frames of the video file, see `generator()`.
+        """
+        return self.generator()
+
+    def get_steps(self) -> int:
+        """
+        Returns the number of frames to skip in order to obtain the desired frame interval.
+
+        Returns:
+            int: The number of frames to skip.
+        """
+        return get_steps(self.metadata.fps, self.interval)
+
+    def extract_frames(self) -> np.ndarray:
+        """
+        Extracts and returns all frames of the video.
+
+        If the `interval` attribute of the instance is set to a positive integer,
+        only every `interval`-th frame is returned. Otherwise, all frames are returned.
+
+        The frames are copied into one contiguous array, like `VideoReader.extract_frames`.
+
+        Returns:
+            A numpy array of shape (frames, height, width, 3), where each entry represents a single frame of the video.
+        """
+        frames = list(self.generator())
+        self.container.close()
+        if not frames:
+            return np.empty((0, self.metadata.height, self.metadata.width, 3), np.uint8)
+        return np.stack(frames)
+
+    def generator(self) -> Iterator[np.ndarray]:
+        """
+        Generator that iterates over the frames of the video file.
+        Each iteration returns a frame as a NumPy array in BGR channel order, like OpenCV.
+
+        Padded frames are returned as strided views over the decoded buffer. They can be passed to OpenCV
+        functions such as `cv2.imwrite` directly; use `np.ascontiguousarray` where a contiguous array is required.
+
+        If the `interval` attribute of the instance is set to a positive integer,
+        only every `interval`-th frame is returned. Otherwise, all frames are returned.
+
+        Returns:
+            Iterator[np.ndarray]: A generator of NumPy arrays representing the video frames.
+        """
+        for frame in self._decode_sampled():
+            yield frame.to_ndarray(format="bgr24")
+
+    def iter_raw(self) -> Iterator[np.ndarray]:
+        """
+        Generator that iterates over the frames of the video file.
+        Each iteration returns a frame as a read-only NumPy array in BGR channel order.
+
+        The array is created with `np.frombuffer` over the plane of the converted frame, which is owned by FFmpeg,
+        so no copy is made. The padding at the end of each row is sliced off, which makes the array a strided view.
+        It stays valid as long as it is referenced, but must not be modified.
+
+        If the `interval` attribute of the instance is set to a positive integer,
+        only every `interval`-th frame is returned. Otherwise, all frames are returned.
+
+        Returns:
+            Iterator[np.ndarray]: A generator of read-only NumPy arrays representing the video frames.
+        """
+        for frame in self._decode_sampled():
+            plane = frame.reformat(format="bgr24").planes[0]
+            array = np.frombuffer(plane, dtype=np.uint8, count=plane.height * plane.line_size)
+            array = array.reshape(plane.height, plane.line_size)
+            array = array[:, :plane.width * 3].reshape(plane.height, plane.width, 3)
+            array.flags.writeable = False
+            yield array
+
+    def _decode_sampled(self) -> Iterator:
+        """
+        Decodes the video and yields the sampled `av.VideoFrame`s. Frames that are not sampled are decoded
+        but never converted to BGR.
+        """
+        steps = self.get_steps()
+        index = 0
+        for frame in self.container.decode(self.stream):
+            # Seeking lands on the keyframe before `start_time`, skip the frames decoded up to it.
+            if frame.time is not None and frame.time < self.start_time:
+                continue
+            if index % steps == 0:
+                yield frame
+            index += 1
@@ -0,0 +1,48 @@
+from typing import Optional
+import numpy as np
+
+
+def get_steps(fps: float, interval: Optional[float]) -> int:
+    """
+    Returns the number of frames between two sampled frames for a given interval.
+
+    Args:
+        fps (float): The frame rate of the video.
+        interval (Optional[float]): The number of seconds between two sampled frames, or None to sample every frame.
+
+    Returns:
+        int: The number of frames between two sampled frames, at least 1.
+    """
+    if interval is None:
+        return 1
+    return max(int(interval * fps), 1)
+
+
+def sample_indices(frame_count: int, fps: float, interval: Optional[float]) -> np.ndarray:
+    """
+    Returns the indices of the sampled frames of a video, see `get_steps`.
+
+    Args:
+        frame_count (int): The total number of frames in the video.
+        fps (float): The frame rate of the video.
+        interval (Optional[float]): The number of seconds between two sampled frames, or None to sample every frame.
+
+    Returns:
+        np.ndarray: The increasing indices of the sampled frames as int64.
+    """
+    return np.arange(0, max(frame_count, 0), get_steps(fps, interval), dtype=np.int64)
+
+
+def sample_count(frame_count: int, fps: float, interval: Optional[float]) -> int:
+    """
+    Returns the number of sampled frames of a video, i.e. the length of `sample_indices`, without building them.
+
+    Args:
+        frame_count (int): The total number of frames in the video.
+        fps (float): The frame rate of the video.
+        interval (Optional[float]): The number of seconds between two sampled frames, or None to sample every frame.
+
+    Returns:
+        int: The number of sampled frames.
+    """
+    return -(-max(frame_count, 0) // get_steps(fps, interval))
@@ -1,62 +1,170 @@
-from typing import Union, List, Tuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, Iterator, Optional, Union, List, Tuple
 from pathlib import Path
-import cv2
-import numpy as np
+import os
+import stat
+from .frame_writer import FrameWriter
+from .gop import probe_keyframes, save_frame_range, split_gops
+from .nvdec_reader import NvDecVideoReader
+from .prefetch import prefetch as prefetch_frames, prefetch_cuda
+from .pyav_reader import PyAVVideoReader
+from .video_meta import VideoMetaData
 from .video_reader import VideoReader
 
+_READERS = {
+    "opencv": VideoReader,
+    "cuda": NvDecVideoReader,
+    "pyav": PyAVVideoReader,
+}
+
+# Every NVDEC session allocates its own pool of decode surfaces, so the number of concurrent sessions is bounded.
+# Data center GPUs have up to 7 NVDEC engines, more sessions than that don't decode any faster.
+_MAX_NVDEC_SESSIONS = 8
+
 
 class Video:
     """
     A class for working with video files.
 
     Attributes:
-        paths (List[Union[str, Path]]): A list of paths to the video files.
+        paths (List[str]): A list of paths to the video files.
+        backend (str): The decoding backend used by `extract_frames`, either "opencv", "pyav" or "cuda".
+        metadata (Dict[str, VideoMetaData]): The metadata of the videos that have been read so far, by path.
 
     Methods:
-        save_frames(output_dir, interval=1, img_format="png"):
+        save_frames(output_dir, interval=1, img_format="png", num_workers=None, raw=False):
             Extracts and saves video frames to disk in the specified image format.
 
         extract_frames(interval=1):
             Extracts frames from the videos in the instance's `paths` list, at a given interval.
+
+        iter_frames(interval=1, prefetch=4):
+            Iterates over the frames of all videos while decoding ahead in a background thread.
+
+        extract_frames_batched(interval=1, num_engines=None):
+            Extracts frames from all videos concurrently with one NVDEC session per video.
+
+        get_metadata(path):
+            Returns the metadata of a video, probing it only once per path.
     """
 
     def __init__(self,
-                 paths: Union[str, Path, List[Union[str, Path]]]
+                 paths: Union[str, Path, List[Union[str, Path]]],
+                 backend: str = "opencv"
                  ) -> None:
         """
         Initializes a `Video` instance with one or more video file paths.
 
         Args:
             paths (Union[str, Path, List[Union[str, Path]]]): A string or list of strings representing the path(s) to the video file(s).
+            backend (str, optional): The decoding backend used by `extract_frames`. "opencv" decodes on the CPU
+                and returns numpy arrays, "pyav" does the same with PyAV and returns padded frames as strided views
+                instead of copies, "cuda" decodes with NVDEC and returns CUDA tensors. Defaults to "opencv".
 
         Returns:
             None
+
+        Raises:
+            ValueError: If `backend` is not supported or a local video file is empty.
+            FileNotFoundError: If a local video file does not exist. URLs and image sequence patterns are not
+                checked.
         """
-        if isinstance(paths, (str, Path)):
+        if backend not in _READERS:
+            raise ValueError(f"Unsupported backend '{backend}', expected one of {list(_READERS)}")
+        if isinstance(paths, (str, os.PathLike)):
             paths = [paths]
-        self.paths = paths
+        self.paths = [os.fspath(path) for path in paths]
+        for path in self.paths:
+            # URLs and image sequences such as "img_%04d.png" are opened by FFmpeg and can't be checked up front.
+            if "://" in path or "%" in path:
+                continue
+            # A single stat checks both, catching truncated files before FFmpeg probes them. Devices such as
+            # cameras report a size of 0 and are skipped.
+            st = os.stat(path)
+            if stat.S_ISREG(st.st_mode) and st.st_size == 0:
+                raise ValueError(f"Video file '{path}' is empty")
+        self.backend = backend
+        self.metadata: Dict[str, VideoMetaData] = {}
 
-    def save_frames(self, output_dir: Union[str, Path], interval=1, img_format: str = "png"):
+    def get_metadata(self, path: Union[str, Path]) -> VideoMetaData:
+        """
+        Returns the metadata of a video, probing it only once per path. Local files are probed from a memory map,
+        other sources fall back to a regular video capture.
+
+        Args:
+            path (Union[str, Path]): The path to the video file.
+
+        Returns:
+            VideoMetaData: The metadata of the video file.
+        """
+        key = str(path)
+        if key not in self.metadata:
+            self.metadata[key] = VideoMetaData.from_path(path=key, use_mmap=True)
+        return self.metadata[key]
+
+    def save_frames(self,
+                    output_dir: Union[str, Path],
+                    interval=1,
+                    img_format: str = "png",
+                    num_workers: Optional[int] = None,
+                    raw: bool = False):
         """
         Extracts and saves video frames to disk in the specified image format.
 
+        Each video is split into ranges of GOPs (groups of pictures starting at a keyframe), which are decoded and
+        encoded in parallel worker processes. With `raw=True`, frames are instead decoded sequentially with PyAV
+        and passed to the encoder as read-only views over the decoded buffers, without copying them.
+
+        Worker processes are only started for more than one worker and videos with more than one GOP range. On
+        platforms that spawn them (Windows, macOS), the calling script then has to guard its entry point with
+        `if __name__ == "__main__":`. Pass `num_workers=1` to save the frames in the calling process.
+
         Args:
             output_dir (Union[str, Path]): The directory to save the extracted frames to.
             interval (int, optional): The frame interval to extract. 
             img_format (str, optional): The image format to save the extracted frames in.
+            num_workers (Optional[int], optional): The number of worker processes. Defaults to `os.cpu_count()`.
+            raw (bool, optional): Whether to write zero-copy frames decoded with PyAV (requires the optional
+                dependency 'av'). Defaults to False.
 
         Returns:
             None
         """
         output_dir = Path(output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
+        if raw:
+            self._save_raw_frames(output_dir, interval, img_format)
+            return
+        num_workers = num_workers or os.cpu_count() or 1
+        executor = None
+        try:
+            for path in self.paths:
+                reader = VideoReader(path, interval=interval, metadata=self.get_metadata(path))
+                steps = reader.get_steps()
+                ranges = [(0, None)]
+                if num_workers > 1:
+                    ranges = split_gops(probe_keyframes(reader.path), len(reader), num_workers)
+                if len(ranges) == 1:
+                    save_frame_range(reader.path, 0, None, steps, output_dir, img_format)
+                    continue
+                if executor is None:
+                    executor = ProcessPoolExecutor(max_workers=num_workers)
+                futures = [executor.submit(save_frame_range, reader.path, start, end, steps, output_dir, img_format)
+                           for start, end in ranges]
+                for future in futures:
+                    future.result()
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+    def _save_raw_frames(self, output_dir: Path, interval, img_format: str) -> None:
         for path in self.paths:
-            with VideoReader(path, interval=interval) as reader:
-                for index, frame in enumerate(reader.generator()):
-                    filename = output_dir / f"{index}.{img_format}"
-                    cv2.imwrite(filename.as_posix(), frame)
+            with PyAVVideoReader(path, interval=interval, metadata=self.get_metadata(path)) as reader, \
+                    FrameWriter() as writer:
+                for index, frame in enumerate(reader.iter_raw()):
+                    writer.write(output_dir / f"{index}.{img_format}", frame)
 
-    def extract_frames(self, interval=1) -> List[Tuple[str, List[np.ndarray]]]:
+    def extract_frames(self, interval=1) -> List[Tuple[str, Any]]:
         """
         Extracts frames from the videos in the instance's `paths` list, at a given interval.
 
@@ -64,12 +172,72 @@ class Video:
             interval (int, optional): The interval at which to extract frames.
 
         Returns:
-            List[Tuple[str, List[np.ndarray]]]: A list of tuples, where each tuple contains the path of a video and a list
-            of numpy arrays representing the extracted frames.
+            List[Tuple[str, Any]]: A list of tuples, where each tuple contains the path of a video and its extracted
+            frames: a single numpy array of shape (frames, height, width, 3) for the "opencv" and "pyav" backends,
+            or a list of CUDA tensors for the "cuda" backend. The numpy arrays replace the lists of frames returned
+            by earlier versions: use `len(frames)` instead of their truth value to check for frames.
         """
+        reader_cls = _READERS[self.backend]
         result = []
         for path in self.paths:
-            with VideoReader(path, interval=interval) as reader:
+            with reader_cls(path, interval=interval, metadata=self.metadata.get(str(path))) as reader:
                 frames = reader.extract_frames()
+            self.metadata[str(path)] = reader.metadata
             result.append((path, frames))
         return result
+
+    def iter_frames(self, interval=1, prefetch: int = 4) -> Iterator[Tuple[str, Any]]:
+        """
+        Iterates over the frames of the videos in the instance's `paths` list, at a given interval.
+
+        Unlike `extract_frames`, frames are handed out while the videos are being decoded: a background thread
+        decodes up to `prefetch` frames ahead, so that decoding overlaps with the work done on each frame by the
+        caller. With the "cuda" backend, frames are copied out of the decoder on a separate CUDA stream.
+
+        Args:
+            interval (int, optional): The interval at which to extract frames.
+            prefetch (int, optional): The maximum number of frames decoded ahead of the caller. Defaults to 4.
+
+        Returns:
+            Iterator[Tuple[str, Any]]: A generator of tuples, where each tuple contains the path of a video and a
+            numpy array (or CUDA tensor for the "cuda" backend) representing a frame.
+        """
+        frames = self._iter_decoded(interval)
+        if self.backend == "cuda":
+            return prefetch_cuda(frames, prefetch)
+        return prefetch_frames(frames, prefetch)
+
+    def _iter_decoded(self, interval) -> Iterator[Tuple[str, Any]]:
+        reader_cls = _READERS[self.backend]
+        for path in self.paths:
+            with reader_cls(path, interval=interval, metadata=self.metadata.get(str(path))) as reader:
+                for frame in reader.generator():
+                    yield path, frame
+            self.metadata[str(path)] = reader.metadata
+
+    def extract_frames_batched(self, interval=1, num_engines: Optional[int] = None) -> Dict[str, List[Any]]:
+        """
+        Extracts frames from the videos in the instance's `paths` list, at a given interval, decoding several videos
+        at once on the GPU.
+
+        Every video is decoded by its own `NvDecVideoReader` in a worker thread, so that up to `num_engines` decode
+        sessions are active at the same time and the GPU's NVDEC engines are kept busy, instead of decoding the
+        videos one after another.
+
+        Args:
+            interval (int, optional): The interval at which to extract frames.
+            num_engines (Optional[int], optional): The maximum number of videos decoded at the same time. Every
+                decode session holds its own surfaces in GPU memory. Defaults to the number of videos, but at most 8.
+
+        Returns:
+            Dict[str, List[torch.Tensor]]: A dictionary mapping the path of each video to a list of CUDA tensors
+            representing the extracted frames.
+        """
+        def extract(path: str) -> List[Any]:
+            with NvDecVideoReader(path, interval=interval, metadata=self.metadata.get(path)) as reader:
+                return reader.extract_frames()
+
+        paths = [str(path) for path in self.paths]
+        num_engines = num_engines or max(min(len(paths), _MAX_NVDEC_SESSIONS), 1)
+        with ThreadPoolExecutor(max_workers=num_engines) as executor:
+            return dict(zip(paths, executor.map(extract, paths)))
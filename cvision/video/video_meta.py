@@ -1,31 +1,110 @@
+import io
+import mmap
+from dataclasses import dataclass
+from typing import Optional
 import cv2
-from typing import NamedTuple
 
 
-class VideoMetaData(NamedTuple):
+class _MmapIO(io.RawIOBase):
+    # A read-only raw stream over a memory map. OpenCV only accepts sources derived from `io.BufferedIOBase`, so
+    # it is wrapped in an `io.BufferedReader` before being handed to `cv2.VideoCapture`.
+    def __init__(self, mm: mmap.mmap) -> None:
+        self._view = memoryview(mm)
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        chunk = self._view[self._position:self._position + len(buffer)]
+        size = len(chunk)
+        memoryview(buffer).cast("B")[:size] = chunk
+        self._position += size
+        return size
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        self._position = max(offset, 0)
+        return self._position
+
+    def tell(self) -> int:
+        return self._position
+
+    def close(self) -> None:
+        # The view has to be released before the memory map can be closed.
+        self._view.release()
+        super().close()
+
+
+@dataclass(frozen=True)
+class VideoMetaData:
+    __slots__ = ("fps", "frame_count", "format", "fourcc", "width", "height")
+
     fps: float
     frame_count: int
-    duration: float
     format: str
     fourcc: int
     width: int
     height: int
 
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state):
+        # Frozen dataclasses block setattr, which the default pickling of slotted classes relies on.
+        for name, value in zip(self.__slots__, state):
+            object.__setattr__(self, name, value)
+
+    @property
+    def duration(self) -> float:
+        return self.frame_count / self.fps if self.fps else 0.0
+
     @classmethod
-    def from_path(cls, path: str):
+    def from_path(cls, path: str, use_mmap: bool = False):
+        if use_mmap:
+            metadata = cls._from_mmap(path)
+            if metadata is not None:
+                return metadata
         cap = cv2.VideoCapture(path)
+        metadata = cls.from_capture(cap)
+        cap.release()
+        return metadata
+
+    @classmethod
+    def _from_mmap(cls, path: str) -> Optional["VideoMetaData"]:
+        # Feeds FFmpeg from a memory map of the file instead of its file protocol, so probing is served from
+        # the page cache without read syscalls. Requires an OpenCV build that accepts file-like objects,
+        # returns None if it doesn't or the file can't be mapped.
+        try:
+            with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+                    io.BufferedReader(_MmapIO(mm)) as stream:
+                cap = cv2.VideoCapture(stream, cv2.CAP_FFMPEG, [])
+                try:
+                    if not cap.isOpened():
+                        return None
+                    return cls.from_capture(cap)
+                finally:
+                    cap.release()
+        except (OSError, ValueError, TypeError, cv2.error):
+            return None
+
+    @classmethod
+    def from_capture(cls, cap: cv2.VideoCapture):
         fps = cap.get(cv2.CAP_PROP_FPS)
         frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        duration = frame_count / fps
         format = cap.get(cv2.CAP_PROP_FORMAT)
         fourcc = int(cap.get(cv2.CAP_PROP_FOURCC))
         width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
         height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-        cap.release()
-        return VideoMetaData(fps,
-                            frame_count,
-                            duration,
-                            format,
-                            fourcc,
-                            width,
-                            height)
+        return cls(fps,
+                   frame_count,
+                   format,
+                   fourcc,
+                   width,
+                   height)
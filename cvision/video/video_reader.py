@@ -1,10 +1,22 @@
 from __future__ import annotations
-from typing import Any, Dict, Iterator, List, Union
+from typing import Any, Dict, Iterator, Optional, Tuple, Union
+import os
+import shutil
+import subprocess
 import traceback
 import cv2
 import numpy as np
+from .frame_pool import FramePool, PooledFrame
+from .gop import estimate_gop_size
+from .sampling import get_steps, sample_count, sample_indices
 from .video_meta import VideoMetaData
 
+# Skips shorter than FFmpeg's default keyframe interval are grabbed without probing the GOP size: probing demuxes
+# the whole file, which costs more than seeking could save there.
+_MIN_PROBE_GAP = 250
+# Probing only demuxes, but must not hold up reading for long if the file is large or on a slow disk.
+_PROBE_TIMEOUT = 10
+
 
 class VideoReader:
     """
@@ -14,21 +26,34 @@ class VideoReader:
         path (str): The path to the video file.
         interval (int): The number of seconds between each frame. Defaults to 1.
         start_time (int): The start time of the video in seconds. Defaults to 0.
-        metadata (VideoMetaData): The metadata of the video file.
+        metadata (VideoMetaData): The metadata of the video file. Read from the video capture opened by
+            `__enter__` unless it was passed in or accessed earlier.
+        pool_size (int): The number of frame buffers preallocated for `iter_pooled`. Defaults to 4.
+        gop_size (Optional[float]): The average number of frames between two keyframes. Probed with `ffprobe` the
+            first time more than 250 frames are skipped, if not given. Only regular local files are probed, for
+            other sources (URLs, devices) and unknown frame counts it is infinite and frames are always grabbed.
 
     Methods:
         __enter__(): Returns the instance of the VideoReader class.
         __exit__(exc_type, exc_val, exc_tb): Releases the video capture and prints any exception traceback if exists.
         __len__(): Returns the total number of frames in the video.
+        __iter__(): Returns the instance of the VideoReader class, which iterates over the frames of the video file.
+        __next__(): Returns the next sampled frame of the video as a NumPy array.
         get_steps(): Returns the number of frames to skip in order to obtain the desired frame interval.
+        get_indices(): Returns the indices of the frames that are sampled.
         extract_frames(): Extracts and returns all frames of the video.
         generator(): Generator that iterates over the frames of the video file. Each iteration returns a frame as a 
             NumPy array.
+        read_batch(batch_size): Generator that iterates over the frames of the video file in batches of NumPy arrays.
+        iter_pooled(): Generator that iterates over the frames of the video file, decoding into reused buffers.
     """
     def __init__(self,
                  path: str,
                  interval: int = 1,
-                 start_time: int = 0) -> None:
+                 start_time: int = 0,
+                 pool_size: int = 4,
+                 metadata: Optional[VideoMetaData] = None,
+                 gop_size: Optional[float] = None) -> None:
         """
         Initializes a new instance of the `VideoReader` class.
 
@@ -37,19 +62,53 @@ class VideoReader:
             interval (int, optional): The desired frame interval. Only every `interval`-th frame will be returned
                 by the `generator` and `extract_frames` methods. Defaults to 1.
             start_time (int, optional): The time in seconds to start reading the video from. Defaults to 0.
+            pool_size (int, optional): The number of frame buffers preallocated for `iter_pooled`. Defaults to 4.
+            metadata (Optional[VideoMetaData], optional): The metadata of the video file, if already known.
+                Defaults to None.
+            gop_size (Optional[float], optional): The average number of frames between two keyframes, if already
+                known. Decides whether frames between two samples are skipped by seeking or by grabbing them.
+                Defaults to None.
         """
         self.path = str(path)
         self.interval = interval
         self.start_time = start_time
-        self.metadata = VideoMetaData.from_path(path=self.path)
+        self.pool_size = pool_size
+        self.gop_size = gop_size
+        self.cap = None
+        self._metadata = metadata
+        self._offset = 0
+
+    @property
+    def metadata(self) -> VideoMetaData:
+        """
+        The metadata of the video file. Probing it opens a separate video capture if it is accessed before
+        `__enter__`.
+        """
+        if self._metadata is None:
+            self._metadata = VideoMetaData.from_path(path=self.path)
+        return self._metadata
 
     def __enter__(self) -> VideoReader:
         """
         Context manager enter method. Returns the instance of the VideoReader class.
         """
         self.cap = cv2.VideoCapture(self.path)
+        if self._metadata is None:
+            self._metadata = VideoMetaData.from_capture(self.cap)
+        self._offset = 0
         if self.start_time > 0:
             self.cap.set(cv2.CAP_PROP_POS_MSEC, self.start_time * 1000)
+            self._offset = int(self.cap.get(cv2.CAP_PROP_POS_FRAMES))
+        self._frame_shape = (self.metadata.height, self.metadata.width, 3)
+        self.pool = FramePool(self._frame_shape, np.uint8, self.pool_size)
+        # Bound once, so that the per-frame loop doesn't look up the capture's methods for every frame.
+        self._grab = self.cap.grab
+        self._retrieve = self.cap.retrieve
+        self._steps = self.get_steps()
+        self._end = self.metadata.frame_count - self._offset
+        self._position = -1
+        self._target = 0
+        self._exhausted = False
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb) -> None:
@@ -64,7 +123,8 @@ class VideoReader:
         """
         if self.cap is not None:
             self.cap.release()
-        if exc_type is not None:
+        # Closing a generator early raises GeneratorExit inside the `with` block, which is not an error.
+        if exc_type is not None and not issubclass(exc_type, GeneratorExit):
             print(f"Error occurred: {exc_val}")
             traceback.print_exception(exc_type, exc_val, exc_tb)
 
@@ -77,6 +137,28 @@ class VideoReader:
         """
         return self.metadata.frame_count
 
+    def __iter__(self) -> VideoReader:
+        """
+        Returns the instance of the VideoReader class, which iterates over the frames of the video file like
+        `generator()`.
+        """
+        return self
+
+    def __next__(self) -> np.ndarray:
+        """
+        Returns the next sampled frame of the video as a NumPy array.
+
+        Raises:
+            StopIteration: If the end of the video has been reached.
+        """
+        if not self._advance():
+            raise StopIteration
+        ret, frame = self._retrieve()
+        if not ret:
+            self._exhausted = True
+            raise StopIteration
+        return frame
+
     def get_steps(self) -> int:
         """
         Returns the number of frames to skip in order to obtain the desired frame interval.
@@ -84,27 +166,134 @@ class VideoReader:
         Returns:
             int: The number of frames to skip.
         """
-        return int(self.interval * self.metadata.fps)
+        return get_steps(self.metadata.fps, self.interval)
+
+    def get_indices(self) -> np.ndarray:
+        """
+        Returns the indices of the frames that are sampled, relative to `start_time`.
+
+        Returns:
+            np.ndarray: The increasing indices of the sampled frames as int64.
+        """
+        frame_count = self.metadata.frame_count - self._offset
+        return sample_indices(frame_count, self.metadata.fps, self.interval)
 
-    def extract_frames(self) -> List[np.ndarray]:
+    def extract_frames(self) -> np.ndarray:
         """
         Extracts and returns all frames of the video.
 
         If the `interval` attribute of the instance is set to a positive integer,
         only every `interval`-th frame is returned. Otherwise, all frames are returned.
 
+        The frames are decoded directly into one preallocated array, sized from the metadata, instead of being
+        allocated one by one. The result is contiguous and can be uploaded to a GPU in a single copy. Frames beyond
+        the frame count in the metadata, which is only an estimate, are appended.
+        If all frames are requested and `ffmpeg` is available, they are decoded by a single `ffmpeg` process, unless
+        its output doesn't match the metadata.
+
+        Returns:
+            A numpy array of shape (frames, height, width, 3), where each entry represents a single frame of the video.
+        """
+        ffmpeg = shutil.which("ffmpeg")
+        if self.interval is None and ffmpeg is not None:
+            frames = self._extract_all_frames_ffmpeg(ffmpeg)
+            if frames is not None:
+                self.cap.release()
+                return frames
+        size = sample_count(self.metadata.frame_count - self._offset, self.metadata.fps, self.interval)
+        frames, count = self._read_into(np.empty((size, *self._frame_shape), np.uint8))
+        if count == size:
+            # The frame count in the metadata is only an estimate, keep reading until the video actually ends.
+            remaining = list(self)
+            if remaining:
+                frames = np.concatenate([frames, np.stack(remaining)])
+                count = len(frames)
+        self.cap.release()
+        return frames[:count]
+
+    def read_batch(self, batch_size: int = 32) -> Iterator[np.ndarray]:
+        """
+        Generator that iterates over the frames of the video file in batches.
+        Each iteration returns a NumPy array of shape (batch, height, width, 3), with up to `batch_size` frames.
+
+        Every batch is decoded directly into a preallocated array, so frames are not allocated one by one. This
+        only batches the output: each frame is still grabbed and retrieved by its own call from Python, which
+        holds the GIL in between. The last batch may hold fewer frames.
+
+        If the `interval` attribute of the instance is set to a positive integer,
+        only every `interval`-th frame is returned. Otherwise, all frames are returned.
+
+        Args:
+            batch_size (int, optional): The maximum number of frames per batch. Defaults to 32.
+
         Returns:
-            A list of numpy arrays, each representing a single frame of the video.
+            Iterator[np.ndarray]: A generator of NumPy arrays, each holding a batch of video frames.
         """
-        frames = []
-        steps = self.get_steps()
-        for frame_id in range(0, self.metadata.frame_count, steps):
-            self.cap.set(cv2.CAP_PROP_POS_FRAMES, frame_id)
-            ret, frame = self.cap.read()
+        while True:
+            frames, count = self._read_into(np.empty((batch_size, *self._frame_shape), np.uint8))
+            if count == 0:
+                return
+            yield frames[:count]
+            if count < batch_size:
+                return
+
+    def _read_into(self, frames: np.ndarray) -> Tuple[np.ndarray, int]:
+        """
+        Retrieves the next sampled frames directly into the entries of `frames`.
+
+        Returns:
+            Tuple[np.ndarray, int]: The array holding the frames and the number of frames read. The array is
+            `frames`, unless the decoded frames don't match its size.
+        """
+        advance = self._advance
+        retrieve = self._retrieve
+        size = len(frames)
+        index = 0
+        while index < size and advance():
+            ret, frame = retrieve(frames[index])
             if not ret:
+                self._exhausted = True
                 break
-            frames.append(frame)
-        self.cap.release()
+            if frame.shape != frames.shape[1:]:
+                # The decoded frames don't match the size in the metadata (e.g. rotated videos), so OpenCV
+                # allocated a new array instead of writing into the preallocated one. Continue at the decoded size.
+                self._frame_shape = frame.shape
+                resized = np.empty((size, *frame.shape), np.uint8)
+                resized[:index] = frames[:index]
+                resized[index] = frame
+                frames = resized
+            index += 1
+        return frames, index
+
+    def _extract_all_frames_ffmpeg(self, ffmpeg: str) -> Optional[np.ndarray]:
+        # ffmpeg decodes with all cores and streams raw BGR frames through a pipe straight into the preallocated
+        # array, without OpenCV's per-frame overhead. Returns None if the output doesn't match the metadata, so the
+        # caller can fall back to OpenCV.
+        cmd = [ffmpeg, "-v", "error", "-nostdin", "-threads", "0"]
+        # Rotate the same way as OpenCV, whose reported frame size is the one the array is sized from.
+        orientation_auto = getattr(cv2, "CAP_PROP_ORIENTATION_AUTO", None)
+        if orientation_auto is None or not self.cap.get(orientation_auto):
+            cmd += ["-noautorotate"]
+        if self.start_time > 0:
+            cmd += ["-ss", str(self.start_time)]
+        cmd += ["-i", self.path, "-map", "0:v:0", "-vsync", "0", "-f", "rawvideo", "-pix_fmt", "bgr24", "pipe:1"]
+        frames = np.empty((max(self._end, 0), self.metadata.height, self.metadata.width, 3), np.uint8)
+        if len(frames) == 0:
+            return None
+        index = 0
+        with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, bufsize=10**8) as proc:
+            while index < len(frames):
+                buffer = memoryview(frames[index]).cast("B")
+                if proc.stdout.readinto(buffer) != len(buffer):
+                    break
+                index += 1
+            # Leftover output means the metadata reported fewer frames than the video has. Closing the pipe stops
+            # ffmpeg in that case.
+            trailing = index == len(frames) and proc.stdout.read(1)
+            proc.stdout.close()
+            returncode = proc.wait()
+        if returncode != 0 or index != len(frames) or trailing:
+            return None
         return frames
 
     def generator(self) -> Iterator[np.ndarray]:
@@ -118,15 +307,66 @@ class VideoReader:
         Returns:
             Iterator[np.ndarray]: A generator of NumPy arrays representing the video frames.
         """
-        while self.cap.isOpened():
-            ret, frame = self.cap.read()
+        yield from self
+
+    def iter_pooled(self) -> Iterator[PooledFrame]:
+        """
+        Generator that iterates over the frames of the video file, decoding into a small pool of reused buffers
+        instead of allocating a new array for every frame.
+
+        Each iteration returns a `PooledFrame`. Its buffer goes back to the pool once the frame is released, either
+        explicitly, by using it in a `with` block or when it is garbage collected, so frames must not be kept
+        around after use. Use `extract_frames` to retain all frames.
+
+        If the `interval` attribute of the instance is set to a positive integer,
+        only every `interval`-th frame is returned. Otherwise, all frames are returned.
+
+        Returns:
+            Iterator[PooledFrame]: A generator of pooled frames.
+        """
+        while self._advance():
+            buffer = self.pool.acquire()
+            ret, frame = self._retrieve(buffer)
             if not ret:
+                self.pool.release(buffer)
+                self._exhausted = True
                 break
-            yield frame
+            yield PooledFrame(frame, self.pool)
+
+    def _advance(self) -> bool:
+        """
+        Advances the video capture to the next sampled frame, so that it can be `retrieve()`d. The sampled indices
+        form a fixed progression. Frames in between are skipped with `grab()`, which doesn't convert them to BGR,
+        unless the next sample is more than a GOP ahead: then seeking, which decodes from the keyframe before the
+        sample, skips more frames than it re-decodes.
 
-            if self.interval is None:
-                continue
+        Iteration ends when `grab()` fails, not at the frame count in the metadata, which is only an estimate.
+
+        Returns:
+            bool: False if the end of the video has been reached, True otherwise.
+        """
+        if self._exhausted:
+            return False
+        target = self._target
+        grab = self._grab
+        position = self._position
+        gap = target - position
+        # Seeking decodes from the keyframe before the target, grabbing decodes every frame up to it. Seeking only
+        # pays off if samples are further apart than a GOP, so the GOP size is probed lazily on the first large gap.
+        if self.gop_size is None and gap > _MIN_PROBE_GAP:
+            # Streams never finish demuxing and remote files would be downloaded, so only local files are probed.
+            if os.path.isfile(self.path):
+                self.gop_size = estimate_gop_size(self.path, self.metadata.frame_count, _PROBE_TIMEOUT)
             else:
-                steps = self.get_steps()
-                self.cap.set(cv2.CAP_PROP_POS_FRAMES, self.cap.get(
-                    cv2.CAP_PROP_POS_FRAMES) + steps)
+                self.gop_size = float("inf")
+        if self.gop_size is not None and gap > self.gop_size:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, self._offset + target)
+            position = target - 1
+        while position < target:
+            if not grab():
+                self._exhausted = True
+                return False
+            position += 1
+        self._position = position
+        self._target = target + self._steps
+        return True
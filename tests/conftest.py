@@ -0,0 +1,18 @@
+import pytest
+
+
+@pytest.fixture(scope="session")
+def clip(tmp_path_factory):
+    """
+    Writes a lossless 64x48 clip of 60 frames at 25 fps, where every pixel of frame `i` has the value `4 * i`.
+    """
+    cv2 = pytest.importorskip("cv2")
+    np = pytest.importorskip("numpy")
+    path = tmp_path_factory.mktemp("clip") / "clip.mkv"
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"FFV1"), 25, (64, 48))
+    if not writer.isOpened():
+        pytest.skip("OpenCV can't encode FFV1")
+    for index in range(60):
+        writer.write(np.full((48, 64, 3), 4 * index, np.uint8))
+    writer.release()
+    return str(path)
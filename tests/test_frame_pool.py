@@ -0,0 +1,49 @@
+import gc
+
+import pytest
+
+pytest.importorskip("cv2")
+np = pytest.importorskip("numpy")
+
+from cvision.video.frame_pool import FramePool, PooledFrame
+
+
+def test_acquire_reuses_released_buffers():
+    pool = FramePool((4, 4, 3), size=1)
+    buffer = pool.acquire()
+    assert buffer.shape == (4, 4, 3) and buffer.dtype == np.uint8
+    pool.release(buffer)
+    assert pool.acquire() is buffer
+
+
+def test_acquire_allocates_when_empty():
+    pool = FramePool((2, 2), size=1)
+    first, second = pool.acquire(), pool.acquire()
+    assert first is not second
+
+
+def test_release_drops_mismatching_and_excess_buffers():
+    pool = FramePool((2, 2), size=1)
+    pool.release(np.empty((3, 3), np.uint8))
+    pool.release(np.empty((2, 2), np.float32))
+    assert len(pool._buffers) == 1
+    pool.release(np.empty((2, 2), np.uint8))
+    assert len(pool._buffers) == 1
+
+
+def test_pooled_frame_releases_once():
+    pool = FramePool((2, 2), size=2)
+    buffer = pool.acquire()
+    frame = PooledFrame(buffer, pool)
+    with frame as array:
+        assert array is buffer
+    frame.release()
+    assert sum(idle is buffer for idle in pool._buffers) == 1
+
+
+def test_pooled_frame_releases_on_garbage_collection():
+    pool = FramePool((2, 2), size=1)
+    buffer = pool.acquire()
+    PooledFrame(buffer, pool)
+    gc.collect()
+    assert pool.acquire() is buffer
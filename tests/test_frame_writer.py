@@ -0,0 +1,44 @@
+import time
+
+import pytest
+
+cv2 = pytest.importorskip("cv2")
+np = pytest.importorskip("numpy")
+
+from cvision.video.frame_writer import FrameWriter
+
+
+def test_writes_frames(tmp_path):
+    frame = np.full((8, 8, 3), 128, np.uint8)
+    with FrameWriter(maxsize=2) as writer:
+        for index in range(5):
+            writer.write(tmp_path / f"{index}.png", frame)
+    assert sorted(path.name for path in tmp_path.iterdir()) == [f"{index}.png" for index in range(5)]
+    assert np.array_equal(cv2.imread(str(tmp_path / "0.png")), frame)
+
+
+def test_raises_write_error_on_exit(tmp_path):
+    frame = np.zeros((8, 8, 3), np.uint8)
+    with pytest.raises(FileNotFoundError):
+        with FrameWriter() as writer:
+            writer.write(tmp_path / "missing" / "0.png", frame)
+
+
+def test_raises_write_error_on_next_write(tmp_path):
+    frame = np.zeros((8, 8, 3), np.uint8)
+    with pytest.raises(FileNotFoundError):
+        with FrameWriter() as writer:
+            writer.write(tmp_path / "missing" / "0.png", frame)
+            deadline = time.monotonic() + 5
+            while writer._error is None and time.monotonic() < deadline:
+                time.sleep(0.01)
+            writer.write(tmp_path / "1.png", frame)
+    assert not (tmp_path / "1.png").exists()
+
+
+def test_does_not_mask_propagating_exception(tmp_path):
+    frame = np.zeros((8, 8, 3), np.uint8)
+    with pytest.raises(KeyError):
+        with FrameWriter() as writer:
+            writer.write(tmp_path / "missing" / "0.png", frame)
+            raise KeyError("decode failed")
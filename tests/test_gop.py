@@ -0,0 +1,56 @@
+import pytest
+
+pytest.importorskip("cv2")
+
+from cvision.video.gop import estimate_gop_size, parse_keyframes, split_gops
+
+
+def test_split_gops_balances_ranges_on_keyframes():
+    keyframes = [0, 30, 60, 90, 120, 150]
+    assert split_gops(keyframes, 180, 3) == [(0, 60), (60, 120), (120, None)]
+
+
+def test_split_gops_starts_ranges_at_next_keyframe():
+    keyframes = [0, 25, 70, 110]
+    assert split_gops(keyframes, 120, 2) == [(0, 70), (70, None)]
+
+
+def test_split_gops_drops_duplicate_and_trailing_ranges():
+    keyframes = [0, 100]
+    assert split_gops(keyframes, 120, 4) == [(0, 100), (100, None)]
+
+
+def test_split_gops_single_range():
+    assert split_gops([0, 30, 60], 90, 1) == [(0, None)]
+    assert split_gops([0], 90, 8) == [(0, None)]
+
+
+def test_split_gops_covers_all_frames_contiguously():
+    keyframes = list(range(0, 1000, 48))
+    ranges = split_gops(keyframes, 1000, 6)
+    assert ranges[0][0] == 0
+    assert ranges[-1][1] is None
+    for (_, end), (start, _) in zip(ranges, ranges[1:]):
+        assert end == start
+        assert start in keyframes
+
+
+def test_parse_keyframes_closed_gop():
+    packets = ["0,K__", "3,___", "1,___", "2,___", "4,K__", "5,___"]
+    assert parse_keyframes(packets) == [0, 4]
+
+
+def test_parse_keyframes_open_gop_uses_display_order():
+    # The second keyframe (pts 8) is followed in decode order by two leading B-frames displayed before it.
+    packets = ["0,K__", "4,___", "2,___", "1,___", "3,___", "8,K__", "6,___", "5,___", "7,___", "9,___"]
+    assert parse_keyframes(packets) == [0, 8]
+
+
+def test_parse_keyframes_skips_missing_timestamps():
+    assert parse_keyframes(["N/A,___", "0,K__", "1,___"]) == [0]
+    assert parse_keyframes([]) == [0]
+
+
+def test_estimate_gop_size_unknown_frame_count():
+    assert estimate_gop_size("missing.mp4", 0) == float("inf")
+    assert estimate_gop_size("missing.mp4", -1) == float("inf")
@@ -0,0 +1,21 @@
+import pytest
+
+pytest.importorskip("cv2")
+
+from cvision.video.nvdec_reader import NvDecVideoReader
+
+
+def test_parse_ops_fuses_into_one_kernel():
+    assert NvDecVideoReader._parse_ops(["bgr2rgb", "resize=(224, 224)", "normalize"]) == (False, (224, 224), True)
+
+
+def test_parse_ops_channel_order():
+    # Frames are decoded as RGB, so only "rgb2bgr" reverses the channels.
+    assert NvDecVideoReader._parse_ops(["bgr2rgb"]) == (False, None, False)
+    assert NvDecVideoReader._parse_ops(["rgb2bgr"]) == (True, None, False)
+    assert NvDecVideoReader._parse_ops(["rgb2bgr", "rgb2bgr"]) == (False, None, False)
+
+
+def test_parse_ops_rejects_unknown_ops():
+    with pytest.raises(ValueError):
+        NvDecVideoReader._parse_ops(["sharpen"])
@@ -0,0 +1,48 @@
+import threading
+
+import pytest
+
+pytest.importorskip("cv2")
+
+from cvision.video.prefetch import prefetch
+
+
+def test_prefetch_preserves_order():
+    assert list(prefetch(iter(range(100)), maxsize=3)) == list(range(100))
+
+
+def test_prefetch_reraises_producer_error():
+    def produce():
+        yield 1
+        raise RuntimeError("decode failed")
+
+    frames = prefetch(produce())
+    assert next(frames) == 1
+    with pytest.raises(RuntimeError, match="decode failed"):
+        next(frames)
+
+
+def test_prefetch_closes_source_on_early_exit():
+    closed = threading.Event()
+
+    def produce():
+        try:
+            for index in range(1000):
+                yield index
+        finally:
+            closed.set()
+
+    frames = prefetch(produce(), maxsize=2)
+    assert next(frames) == 0
+    frames.close()
+    assert closed.wait(timeout=5)
+
+
+def test_iter_frames_early_exit_is_silent(clip, capsys):
+    from cvision import Video
+
+    for _ in Video(clip).iter_frames(interval=None):
+        break
+    captured = capsys.readouterr()
+    assert "Error occurred" not in captured.out
+    assert "GeneratorExit" not in captured.err
@@ -0,0 +1,35 @@
+import pytest
+
+pytest.importorskip("cv2")
+np = pytest.importorskip("numpy")
+
+from cvision.video.sampling import get_steps, sample_count, sample_indices
+
+
+def test_get_steps():
+    assert get_steps(25.0, 1) == 25
+    assert get_steps(29.97, 2) == 59
+    assert get_steps(25.0, None) == 1
+
+
+def test_get_steps_clamps_to_one():
+    assert get_steps(25.0, 0.01) == 1
+    assert get_steps(0.0, 1) == 1
+
+
+def test_sample_indices():
+    indices = sample_indices(100, 25.0, 1)
+    assert indices.dtype == np.int64
+    assert indices.tolist() == [0, 25, 50, 75]
+    assert sample_indices(3, 25.0, None).tolist() == [0, 1, 2]
+
+
+def test_sample_indices_unknown_frame_count():
+    assert len(sample_indices(0, 25.0, 1)) == 0
+    assert len(sample_indices(-1, 25.0, 1)) == 0
+
+
+@pytest.mark.parametrize("frame_count", [-1, 0, 1, 24, 25, 26, 100, 101])
+@pytest.mark.parametrize("interval", [None, 0.5, 1])
+def test_sample_count_matches_indices(frame_count, interval):
+    assert sample_count(frame_count, 25.0, interval) == len(sample_indices(frame_count, 25.0, interval))
@@ -0,0 +1,15 @@
+import pytest
+
+pytest.importorskip("cv2")
+
+from cvision.video import video as video_module
+from cvision.video.video import Video
+
+
+def test_save_frames_single_worker_runs_in_process(clip, tmp_path, monkeypatch):
+    def no_pool(*args, **kwargs):
+        raise AssertionError("no worker processes expected")
+
+    monkeypatch.setattr(video_module, "ProcessPoolExecutor", no_pool)
+    Video(clip).save_frames(tmp_path, interval=0.4, num_workers=1)
+    assert sorted(int(path.stem) for path in tmp_path.iterdir()) == list(range(6))
@@ -0,0 +1,40 @@
+import copy
+import pickle
+
+import pytest
+
+pytest.importorskip("cv2")
+
+from cvision.video.video_meta import VideoMetaData
+
+
+def make_metadata():
+    return VideoMetaData(fps=25.0, frame_count=250, format="", fourcc=875967080, width=1920, height=1080)
+
+
+def test_pickle_round_trip():
+    metadata = make_metadata()
+    assert pickle.loads(pickle.dumps(metadata)) == metadata
+
+
+def test_deepcopy_round_trip():
+    metadata = make_metadata()
+    copied = copy.deepcopy(metadata)
+    assert copied == metadata
+    assert copied is not metadata
+
+
+def test_duration():
+    assert make_metadata().duration == 10.0
+    assert VideoMetaData(0.0, 0, "", 0, 0, 0).duration == 0.0
+
+
+def test_from_mmap(clip):
+    metadata = VideoMetaData._from_mmap(clip)
+    assert metadata is not None
+    assert metadata == VideoMetaData.from_path(clip)
+    assert (metadata.width, metadata.height, metadata.frame_count) == (64, 48, 60)
+
+
+def test_from_mmap_missing_file(tmp_path):
+    assert VideoMetaData._from_mmap(str(tmp_path / "missing.mp4")) is None
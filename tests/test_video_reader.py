@@ -0,0 +1,80 @@
+import shutil
+
+import pytest
+
+pytest.importorskip("cv2")
+np = pytest.importorskip("numpy")
+
+from cvision.video import video_reader
+from cvision.video.video import Video
+from cvision.video.video_meta import VideoMetaData
+from cvision.video.video_reader import VideoReader
+
+
+def frame_indices(frames):
+    # Every pixel of frame `i` of the clip has the value `4 * i`.
+    return [int(round(float(frame.mean()) / 4)) for frame in frames]
+
+
+def test_extract_frames_samples_interval(clip):
+    with VideoReader(clip, interval=0.4) as reader:
+        frames = reader.extract_frames()
+    assert frames.shape == (6, 48, 64, 3)
+    assert frame_indices(frames) == [0, 10, 20, 30, 40, 50]
+
+
+def test_extract_frames_from_start_time(clip):
+    with VideoReader(clip, interval=1, start_time=1) as reader:
+        frames = reader.extract_frames()
+    assert frame_indices(frames) == [25, 50]
+
+
+def test_seeking_matches_grabbing(clip):
+    with VideoReader(clip, interval=0.4) as reader:
+        grabbed = reader.extract_frames()
+    # A GOP size of 1 makes every skip a seek.
+    with VideoReader(clip, interval=0.4, gop_size=1) as reader:
+        seeked = reader.extract_frames()
+    assert np.array_equal(grabbed, seeked)
+
+
+def test_iteration_matches_extract_frames(clip):
+    with VideoReader(clip, interval=0.2) as reader:
+        frames = reader.extract_frames()
+    with VideoReader(clip, interval=0.2) as reader:
+        assert np.array_equal(np.stack(list(reader.generator())), frames)
+    with VideoReader(clip, interval=0.2) as reader:
+        assert np.array_equal(np.concatenate(list(reader.read_batch(batch_size=4))), frames)
+    with VideoReader(clip, interval=0.2) as reader:
+        pooled = []
+        for frame in reader.iter_pooled():
+            with frame as array:
+                pooled.append(array.copy())
+        assert np.array_equal(np.stack(pooled), frames)
+
+
+def test_reads_past_underestimated_frame_count(clip):
+    metadata = VideoMetaData(25.0, 40, "", 0, 64, 48)
+    with VideoReader(clip, interval=None, metadata=metadata) as reader:
+        assert len(reader.extract_frames()) == 60
+    metadata = VideoMetaData(25.0, 0, "", 0, 64, 48)
+    with VideoReader(clip, interval=0.4, metadata=metadata) as reader:
+        assert frame_indices(reader) == [0, 10, 20, 30, 40, 50]
+
+
+def test_falls_back_to_opencv_if_ffmpeg_fails(clip, monkeypatch):
+    failing = shutil.which("false")
+    if failing is None:
+        pytest.skip("no 'false' executable")
+    monkeypatch.setattr(video_reader.shutil, "which", lambda name: failing)
+    with VideoReader(clip, interval=None) as reader:
+        frames = reader.extract_frames()
+    assert frame_indices(frames) == list(range(60))
+
+
+def test_video_extract_frames(clip):
+    video = Video(clip)
+    [(path, frames)] = video.extract_frames(interval=0.4)
+    assert path == clip
+    assert frames.shape == (6, 48, 64, 3)
+    assert video.get_metadata(clip).frame_count == 60